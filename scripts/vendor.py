@@ -8,18 +8,181 @@ specific files into the current project.
 
 import argparse
 import fnmatch
+import itertools
 import json
+import logging
 import os
+import posixpath
+import re
 import shutil
 import subprocess
 import sys
+import tarfile
 import tempfile
+import threading
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
-import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+
+try:
+    # ISA-L's SIMD inflate and CRC32 decompress tarballs several times faster
+    from isal.igzip import IGzipFile as GzipFile
+except ImportError:
+    from gzip import GzipFile
+
+log = logging.getLogger("vendor")
+
+# Tests whether a path matches a list of glob patterns
+_Matcher = Callable[[str], bool]
+
+# Full commit SHAs, unlike e.g. the branch names in a release's target_commitish
+_COMMIT_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+# File copies are I/O-bound, so use more workers than cores
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _fast_copy(src: Union[str, Path], dst: Path):
+    """Copy file contents without metadata, in-kernel where supported."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+            return
+        except OSError:
+            # Unsupported by the kernel or filesystem, use the regular path
+            pass
+
+    shutil.copyfile(src, dst)
+
+
+def _should_include_file(
+    file_path: str, include_match: Optional[_Matcher], exclude_match: Optional[_Matcher]
+) -> bool:
+    """Determine if a file should be included based on include/exclude patterns."""
+    # No include patterns includes everything, no exclude patterns excludes nothing
+    return (include_match is None or include_match(file_path)) and (
+        exclude_match is None or not exclude_match(file_path)
+    )
+
+
+def _build_matcher(patterns: List[str]) -> _Matcher:
+    """Build a matcher that is true if a path matches any of the glob patterns."""
+
+    def _is_suffix_pattern(pattern: str) -> bool:
+        return pattern.startswith("*.") and not any(c in pattern[2:] for c in "*?[")
+
+    # Patterns like "*.py" only test the extension, which str.endswith does in C
+    suffixes = tuple(p[1:] for p in patterns if _is_suffix_pattern(p))
+    complex_patterns = [p for p in patterns if not _is_suffix_pattern(p)]
+
+    if not complex_patterns:
+        return lambda path: path.endswith(suffixes)
+
+    pattern_re = re.compile(
+        "|".join(f"(?:{fnmatch.translate(p)})" for p in complex_patterns)
+    )
+    if not suffixes:
+        return lambda path: pattern_re.match(path) is not None
+    return lambda path: path.endswith(suffixes) or pattern_re.match(path) is not None
+
+
+def _static_prefix(pattern: str) -> str:
+    """Get the directory part of a glob pattern that precedes any wildcard."""
+    head = pattern.split("*", 1)[0].split("?", 1)[0].split("[", 1)[0]
+    return head.rsplit("/", 1)[0] if "/" in head else ""
+
+
+def _iter_files(
+    root: Union[str, Path], rel_root: str, exclude_match: Optional[_Matcher]
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Recursively yield (entry, relative path) for files under root.
+
+    Directories whose name matches exclude_match are not descended into. Uses
+    os.scandir so entry types come from the directory listing without extra stat calls.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    for entry in entries:
+        rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+        if entry.is_dir():
+            # Like os.walk, do not follow symlinked directories
+            if entry.is_symlink() or (
+                exclude_match is not None and exclude_match(entry.name)
+            ):
+                continue
+            yield from _iter_files(entry.path, rel_path, exclude_match)
+        else:
+            yield entry, rel_path
+
+
+def _write_if_changed(path: Path, data: bytes):
+    """Atomically write data to path, unless it already has that content."""
+    if path.exists() and path.read_bytes() == data:
+        return
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _copy_files(
+    copies: List[Tuple[Union[str, Path], Path]], preserve_stat: bool = False
+):
+    """Copy (src, dst) pairs concurrently.
+
+    If several pairs share a destination, only the last one is copied, as if the
+    copies ran sequentially; concurrent writes to one file would interleave.
+    """
+    copies = list({dst: (src, dst) for src, dst in copies}.values())
+
+    # Create destination directories in one pass before copying. Ancestors of
+    # other destination directories are created by mkdir(parents=True).
+    parents = {dst.parent for _, dst in copies}
+    ancestors = {ancestor for parent in parents for ancestor in parent.parents}
+    for parent in sorted(parents - ancestors):
+        parent.mkdir(parents=True, exist_ok=True)
+
+    def _copy(pair: Tuple[Union[str, Path], Path]):
+        src, dst = pair
+        _fast_copy(src, dst)
+        if preserve_stat:
+            shutil.copystat(src, dst)
+        else:
+            # Git tracks the executable bit, so always keep permissions
+            shutil.copymode(src, dst)
+
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        # Consume the results so that copy errors are raised
+        list(executor.map(_copy, copies))
+
+
+def _remove_in_background(path: Path):
+    """Remove a directory tree without waiting for the removal to finish."""
+    if os.name == "posix":
+        # Detached, so the removal outlives this process if needed
+        subprocess.Popen(
+            ["rm", "-rf", str(path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    else:
+        threading.Thread(
+            target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}
+        ).start()
 
 
 class VendorManager:
@@ -33,26 +196,67 @@ class VendorManager:
         self.files_to_vendor = self.config["vendor"].get("files", [])
         self.folders_to_vendor = self.config["vendor"].get("folders", [])
         self.destination = Path(self.config["vendor"]["destination"])
+        self._session = self._create_session()
+        self._etag: Optional[str] = None
+        self._pat_cache: Dict[Tuple[str, ...], Optional[_Matcher]] = {}
+
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session shared by the release lookup and tarball download."""
+        session = requests.Session()
+        retry = Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        session.mount("https://", HTTPAdapter(pool_maxsize=4, max_retries=retry))
+        session.headers["Accept-Encoding"] = "gzip"
+        return session
 
     def _load_config(self) -> Dict:
-        """Load configuration from YAML file."""
+        """Load configuration from YAML or TOML file."""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
+        if self.config_path.suffix == ".toml":
+            with open(self.config_path, "rb") as f:
+                return tomllib.load(f)
+
+        # Imported here so TOML configs don't pay for importing PyYAML
+        import yaml
+
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(self.config_path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=loader)
 
-    def _get_latest_version(self) -> Tuple[str, str]:
+    def _compile_patterns(self, patterns: List[str]) -> Optional[_Matcher]:
+        """Compile glob patterns into one matcher, or None if there are no patterns."""
+        key = tuple(patterns)
+        if key not in self._pat_cache:
+            self._pat_cache[key] = _build_matcher(patterns) if patterns else None
+        return self._pat_cache[key]
+
+    def _get_latest_version(self) -> Optional[Tuple[str, str]]:
         """Get the latest version information."""
         return self._get_latest_release()
 
-    def _get_latest_release(self) -> Tuple[str, str]:
-        """Get the latest release version and commit SHA."""
+    def _get_latest_release(self) -> Optional[Tuple[str, str]]:
+        """Get the latest release version and commit SHA.
+
+        Returns None if the release is unchanged since the last vendor (HTTP 304).
+        """
         url = f"https://api.github.com/repos/{self.repo_info['owner']}/{self.repo_info['repo']}/releases/latest"
 
-        headers = {}
-        response = requests.get(url, headers=headers)
+        headers = self._api_headers("application/vnd.github+json")
+        etag = self._get_vendor_info().get("etag")
+        if etag:
+            # Conditional requests answered with 304 do not count toward the rate limit
+            headers["If-None-Match"] = etag
+
+        response = self._session.get(url, headers=headers)
+        if response.status_code == 304:
+            self._etag = etag
+            return None
         response.raise_for_status()
+        self._etag = response.headers.get("ETag")
 
         release_data = response.json()
         version = release_data["tag_name"]
@@ -60,6 +264,42 @@ class VendorManager:
 
         return version, commit_sha
 
+    def _resolve_commit_sha(self, ref: str) -> Optional[str]:
+        """Resolve a tag or branch to a full commit SHA, or None if that fails."""
+        url = f"https://api.github.com/repos/{self.repo_info['owner']}/{self.repo_info['repo']}/commits/{ref}"
+
+        try:
+            response = self._session.get(
+                url, headers=self._api_headers("application/vnd.github.sha")
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            log.warning("Warning: Could not resolve %s to a commit: %s", ref, e)
+            return None
+
+        commit_sha = response.text.strip()
+        return commit_sha if _COMMIT_SHA_RE.fullmatch(commit_sha) else None
+
+    def _api_headers(self, accept: str) -> Dict[str, str]:
+        """Get the headers for a GitHub API request."""
+        headers = {"Accept": accept}
+        token = os.environ.get("GITHUB_TOKEN")
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def _get_current_commit_sha(self) -> Optional[str]:
+        """Get the commit SHA of the currently vendored version."""
+        return self._get_vendor_info().get("commit_sha")
+
+    def _get_vendor_info(self) -> Dict:
+        """Get the stored vendor info, or an empty dict if nothing is vendored yet."""
+        info_file = self.destination / ".vendor_info"
+        if info_file.exists():
+            with open(info_file, "r") as f:
+                return json.load(f)
+        return {}
+
     def _get_current_version(self) -> Optional[str]:
         """Get the currently vendored version."""
         version_file = self.destination / ".vendor_version"
@@ -73,191 +313,530 @@ class VendorManager:
         self.destination.mkdir(parents=True, exist_ok=True)
 
         version_file = self.destination / ".vendor_version"
-        with open(version_file, "w") as f:
-            f.write(f"{version}\n")
+        _write_if_changed(version_file, f"{version}\n".encode())
 
-        info_file = self.destination / ".vendor_info"
         info = {
             "version": version,
             "commit_sha": commit_sha,
-            "vendored_at": datetime.now().isoformat(),
             "repository": f"{self.repo_info['owner']}/{self.repo_info['repo']}",
+            "etag": self._etag,
         }
-        with open(info_file, "w") as f:
-            json.dump(info, f, indent=2)
+        # Keep the previous timestamp if nothing else changed
+        previous_info = self._get_vendor_info()
+        previous_vendored_at = previous_info.pop("vendored_at", None)
+        if previous_info == info and previous_vendored_at:
+            info["vendored_at"] = previous_vendored_at
+        else:
+            info["vendored_at"] = datetime.now().isoformat()
+        self._write_vendor_info(info)
+
+    def _save_etag(self):
+        """Save the latest release ETag if it changed without a re-vendor.
+
+        The release ETag also changes with e.g. asset download counts. Without
+        this, every later run would send a stale If-None-Match and get a 200.
+        """
+        info = self._get_vendor_info()
+        if info and info.get("etag") != self._etag:
+            info["etag"] = self._etag
+            self._write_vendor_info(info)
+
+    def _write_vendor_info(self, info: Dict):
+        """Write the vendor info file, keeping its bytes stable."""
+        info_file = self.destination / ".vendor_info"
+        _write_if_changed(
+            info_file, json.dumps(info, indent=2, sort_keys=True).encode()
+        )
+
+    def _stream_vendor_from_tarball(self, commit_sha: str):
+        """Vendor files straight from the repository tarball, without a checkout.
+
+        Regular files are vendored, and symlinks by the content of their target
+        like the git fallback does; other tarball members are skipped. Files are
+        staged next to the destination and only moved into place once the whole
+        tarball was read, so a failed download leaves it untouched.
+        """
+        url = f"https://codeload.github.com/{self.repo_info['owner']}/{self.repo_info['repo']}/tar.gz/{commit_sha}"
+
+        folders = []
+        for folder_config in self.folders_to_vendor:
+            folder_path = folder_config["path"].strip("/")
+            log.info("Vendoring folder: %s", folder_path)
+            folders.append(
+                (
+                    folder_path,
+                    self.destination / Path(folder_path).name,
+                    self._compile_patterns(folder_config.get("include", [])),
+                    self._compile_patterns(folder_config.get("exclude", [])),
+                    folder_config.get("preserve_structure", True),
+                    folder_config.get("preserve_stat", False),
+                )
+            )
+
+        def _destinations(name: str) -> List[Tuple[Path, bool]]:
+            """Get the (destination, preserve_stat) pairs for a repository path."""
+            destinations = []
+            if name in self.files_to_vendor:
+                destinations.append((self.destination / Path(name).name, False))
+
+            for (
+                folder_path,
+                folder_destination,
+                include_match,
+                exclude_match,
+                *flags,
+            ) in folders:
+                if not name.startswith(f"{folder_path}/"):
+                    continue
+                rel_path_str = name[len(folder_path) + 1 :]
+                preserve_structure, preserve_stat = flags
+
+                # Files below excluded directories are never walked
+                parent_dirs = rel_path_str.split("/")[:-1]
+                if exclude_match is not None and any(
+                    exclude_match(part) for part in parent_dirs
+                ):
+                    continue
+                if not _should_include_file(rel_path_str, include_match, exclude_match):
+                    continue
+
+                if preserve_structure:
+                    dst_path = folder_destination / rel_path_str
+                else:
+                    # Flatten structure - just use filename
+                    dst_path = folder_destination / Path(name).name
+                destinations.append((dst_path, preserve_stat))
+            return destinations
+
+        found_files = set()
+        created_dirs = set()
+        staged_files: Dict[Path, Path] = {}
+        # Repository paths of staged regular files and of directories
+        staged_names: Dict[str, Path] = {}
+        dir_names = set()
+        # Symlink targets by repository path, and the symlinks that matched
+        link_targets: Dict[str, str] = {}
+        matched_links: List[Tuple[str, List[Tuple[Path, bool]]]] = []
+
+        def _stage_dir(staged_path: Path):
+            if staged_path.parent not in created_dirs:
+                staged_path.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(staged_path.parent)
+
+        def _resolve_link(name: str) -> Optional[str]:
+            """Resolve a symlink to a repository path, None if it points outside."""
+            for _ in range(40):
+                target = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(name), link_targets[name])
+                )
+                if target.startswith(("/", "../")) or target == "..":
+                    return None
+                if target not in link_targets:
+                    return target
+                name = target
+            return None
+
+        self.destination.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(
+            tempfile.mkdtemp(prefix=".vendor_", dir=self.destination.parent)
+        )
+        try:
+            with self._session.get(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+
+                with (
+                    GzipFile(fileobj=response.raw) as decompressed,
+                    tarfile.open(fileobj=decompressed, mode="r|") as tar,
+                ):
+                    for member in tar:
+                        # Strip the leading "{repo}-{sha}/" component
+                        _, _, name = member.name.partition("/")
+                        if ".." in name.split("/"):
+                            continue
+                        if member.isdir():
+                            dir_names.add(name.rstrip("/"))
+                            continue
+                        if member.issym():
+                            # The target may come later in the stream, so
+                            # resolve symlinks once the whole tarball was read
+                            link_targets[name] = member.linkname
+                            destinations = _destinations(name)
+                            if destinations:
+                                matched_links.append((name, destinations))
+                            continue
+                        if not member.isfile():
+                            continue
+
+                        destinations = _destinations(name)
+                        if not destinations:
+                            continue
+                        found_files.add(name)
+
+                        src = tar.extractfile(member)
+                        first_staged = None
+                        for dst_path, preserve_stat in destinations:
+                            staged_path = staging_dir / dst_path.relative_to(
+                                self.destination
+                            )
+                            _stage_dir(staged_path)
+
+                            if first_staged is None:
+                                with open(staged_path, "wb") as dst:
+                                    shutil.copyfileobj(src, dst)
+                                first_staged = staged_path
+                                staged_names[name] = staged_path
+                            else:
+                                _fast_copy(first_staged, staged_path)
+
+                            if preserve_stat:
+                                os.chmod(staged_path, member.mode)
+                                os.utime(staged_path, (member.mtime, member.mtime))
+                            elif member.mode & 0o111:
+                                # Git tracks the executable bit, so always keep it
+                                mode = os.stat(staged_path).st_mode
+                                os.chmod(staged_path, mode | (member.mode & 0o111))
+                            staged_files[dst_path] = staged_path
+                            log.debug("Vendored: %s -> %s", name, dst_path)
+
+            # Copy the staged targets of symlinks, like the copy in the fallback
+            # follows them. Like os.walk, symlinked directories are skipped.
+            for name, destinations in matched_links:
+                target = _resolve_link(name)
+                if target in dir_names:
+                    continue
+                if target not in staged_names:
+                    log.warning(
+                        "Warning: Symlink %s not vendored, target %s not vendored",
+                        name,
+                        link_targets[name],
+                    )
+                    continue
+                found_files.add(name)
+
+                for dst_path, preserve_stat in destinations:
+                    staged_path = staging_dir / dst_path.relative_to(self.destination)
+                    _stage_dir(staged_path)
+                    _fast_copy(staged_names[target], staged_path)
+                    if preserve_stat:
+                        shutil.copystat(staged_names[target], staged_path)
+                    else:
+                        shutil.copymode(staged_names[target], staged_path)
+                    staged_files[dst_path] = staged_path
+                    log.debug("Vendored: %s -> %s", name, dst_path)
+
+            # The tarball was read completely, move the staged files into place
+            for dst_path, staged_path in staged_files.items():
+                dst_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged_path, dst_path)
+        except (
+            requests.RequestException,
+            Urllib3HTTPError,
+            tarfile.TarError,
+            OSError,
+            EOFError,
+        ) as e:
+            # response.raw is read directly, so dropped connections surface as
+            # urllib3 errors; OSError and EOFError cover corrupt gzip streams
+            raise RuntimeError(f"Failed to stream repository tarball: {e}")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        for file_path in self.files_to_vendor:
+            if file_path not in found_files:
+                log.warning("Warning: File %s not found in repository", file_path)
+        for folder_path, *_ in folders:
+            if not any(name.startswith(f"{folder_path}/") for name in found_files):
+                log.warning("Warning: No files vendored from folder %s", folder_path)
+        log.info("Vendored %d files", len(found_files))
+
+    def _sparse_checkout_paths(self) -> List[str]:
+        """Get the directories to materialize in a sparse checkout."""
+        # Files at the repository root are always checked out in cone mode
+        paths = {os.path.dirname(file_path) for file_path in self.files_to_vendor}
+        paths.update(folder_config["path"] for folder_config in self.folders_to_vendor)
+        paths.discard("")
+        return sorted(paths)
+
+    def _get_cache_dir(self) -> Path:
+        """Get the directory of the cached bare clone of the repository."""
+        # Per the XDG spec, relative paths are invalid and must be ignored
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+        if not cache_home or not os.path.isabs(cache_home):
+            cache_home = Path.home() / ".cache"
+        return (
+            Path(cache_home)
+            / "vendor"
+            / f"{self.repo_info['owner']}-{self.repo_info['repo']}.git"
+        )
 
     def _clone_repository(self, commit_sha: str) -> Path:
-        """Clone the repository to a temporary directory."""
+        """Check out the repository to a temporary directory.
+
+        Uses a persistent blobless bare clone as cache, so repeated runs only
+        fetch new objects, and adds a sparse worktree of the commit from it.
+        """
         repo_url = (
             f"https://github.com/{self.repo_info['owner']}/{self.repo_info['repo']}.git"
         )
 
+        def _git(*args: str) -> str:
+            result = subprocess.run(
+                ["git", *args], check=True, capture_output=True, text=True
+            )
+            return result.stdout.strip()
+
+        cache_dir = self._get_cache_dir()
         temp_dir = tempfile.mkdtemp(prefix="vendor_")
 
         try:
-            # Clone the repository
-            subprocess.run(
-                ["git", "clone", "--depth", "1", repo_url, temp_dir],
-                check=True,
-                capture_output=True,
+            # Blobless clone: fetches commits and trees, blobs only on checkout
+            if not cache_dir.exists():
+                cache_dir.parent.mkdir(parents=True, exist_ok=True)
+                _git(
+                    "clone",
+                    "--bare",
+                    "--filter=blob:none",
+                    repo_url,
+                    str(cache_dir),
+                )
+
+            cache = ["-C", str(cache_dir)]
+            _git(*cache, "fetch", "--filter=blob:none", "origin", commit_sha)
+            fetched_sha = _git(*cache, "rev-parse", "FETCH_HEAD")
+
+            # Drop worktrees of earlier runs whose directories were removed
+            _git(*cache, "worktree", "prune")
+            _git(
+                *cache,
+                "worktree",
+                "add",
+                "--no-checkout",
+                "--detach",
+                temp_dir,
+                fetched_sha,
+            )
+
+            # Restrict the working tree to the vendored paths
+            _git("-C", temp_dir, "sparse-checkout", "init", "--cone")
+            _git(
+                "-C", temp_dir, "sparse-checkout", "set", *self._sparse_checkout_paths()
             )
 
             # Checkout specific commit
-            subprocess.run(
-                ["git", "checkout", commit_sha],
-                cwd=temp_dir,
-                check=True,
-                capture_output=True,
+            _git(
+                "-C",
+                temp_dir,
+                "-c",
+                "advice.detachedHead=false",
+                "checkout",
+                "--detach",
+                fetched_sha,
             )
 
             return Path(temp_dir)
         except subprocess.CalledProcessError as e:
             shutil.rmtree(temp_dir, ignore_errors=True)
-            raise RuntimeError(f"Failed to clone repository: {e}")
+            raise RuntimeError(f"Failed to clone repository: {e}: {e.stderr}")
 
     def _vendor_folder(self, repo_path: Path, folder_config: Dict):
         """Vendor a folder with inclusion/exclusion patterns."""
 
-        def _matches_pattern(file_path: str, patterns: List[str]) -> bool:
-            """Check if a file path matches any of the given glob patterns."""
-            if not patterns:
-                return True
-
-            for pattern in patterns:
-                if fnmatch.fnmatch(file_path, pattern):
-                    return True
-            return False
-
-        def _should_include_file(
-            file_path: str, include_patterns: List[str], exclude_patterns: List[str]
-        ) -> bool:
-            """Determine if a file should be included based on include/exclude patterns."""
-            # If no include patterns, include everything
-            if not include_patterns:
-                include_match = True
-            else:
-                include_match = _matches_pattern(file_path, include_patterns)
-
-            # If no exclude patterns, exclude nothing
-            if not exclude_patterns:
-                exclude_match = False
-            else:
-                exclude_match = _matches_pattern(file_path, exclude_patterns)
-
-            return include_match and not exclude_match
-
         folder_path = folder_config["path"]
         include_patterns = folder_config.get("include", [])
         exclude_patterns = folder_config.get("exclude", [])
         preserve_structure = folder_config.get("preserve_structure", True)
+        preserve_stat = folder_config.get("preserve_stat", False)
+
+        # Compile each pattern list once instead of matching pattern by pattern
+        include_match = self._compile_patterns(include_patterns)
+        exclude_match = self._compile_patterns(exclude_patterns)
 
         src_folder = repo_path / folder_path
 
         if not src_folder.exists():
-            print(f"Warning: Folder {folder_path} not found in repository")
+            log.warning("Warning: Folder %s not found in repository", folder_path)
             return
 
         if not src_folder.is_dir():
-            print(f"Warning: {folder_path} is not a directory")
+            log.warning("Warning: %s is not a directory", folder_path)
             return
 
-        print(f"Vendoring folder: {folder_path}")
+        log.info("Vendoring folder: %s", folder_path)
 
         # Create the folder as a subdirectory in the destination
         folder_name = Path(folder_path).name
         folder_destination = self.destination / folder_name
 
-        # Walk through the folder recursively
-        for root, dirs, files in os.walk(src_folder):
-            root_path = Path(root)
-
-            # Filter directories based on exclude patterns
-            dirs[:] = [d for d in dirs if not _matches_pattern(d, exclude_patterns)]
-
-            for file_name in files:
-                file_path = root_path / file_name
+        copies = []
 
-                # Get relative path from the source folder
-                rel_path = file_path.relative_to(src_folder)
-                rel_path_str = str(rel_path)
-
-                # Check if file should be included
-                if not _should_include_file(
-                    rel_path_str, include_patterns, exclude_patterns
+        # Only walk the subtrees that include patterns can match
+        prefixes = sorted({_static_prefix(p) for p in include_patterns})
+        if not prefixes or "" in prefixes:
+            walk_roots = [""]
+        else:
+            walk_roots = []
+            for prefix in prefixes:
+                # Skip nested prefixes, which are walked as part of their parent
+                if any(prefix.startswith(f"{root}/") for root in walk_roots):
+                    continue
+                # Respect directory excludes on the prefix itself
+                if exclude_match is not None and any(
+                    exclude_match(part) for part in Path(prefix).parts
                 ):
                     continue
+                walk_roots.append(prefix)
 
-                # Determine destination path
-                if preserve_structure:
-                    dst_path = folder_destination / rel_path
-                else:
-                    # Flatten structure - just use filename
-                    dst_path = folder_destination / file_name
+        # Walk through the folder recursively
+        walk = itertools.chain.from_iterable(
+            _iter_files(src_folder / prefix, prefix, exclude_match)
+            for prefix in walk_roots
+        )
+        for entry, rel_path_str in walk:
+            # Check if file should be included
+            if not _should_include_file(rel_path_str, include_match, exclude_match):
+                continue
 
-                # Create destination directory if needed
-                dst_path.parent.mkdir(parents=True, exist_ok=True)
+            # Determine destination path
+            if preserve_structure:
+                dst_path = folder_destination / rel_path_str
+            else:
+                # Flatten structure - just use filename
+                dst_path = folder_destination / entry.name
+
+            copies.append((entry.path, dst_path))
+            log.debug("Vendored: %s/%s -> %s", folder_path, rel_path_str, dst_path)
 
-                # Copy file
-                shutil.copy2(file_path, dst_path)
-                print(f"Vendored: {folder_path}/{rel_path_str} -> {dst_path}")
+        _copy_files(copies, preserve_stat)
+        log.info("Vendored %d files from %s", len(copies), folder_path)
 
-    def _vendor_files(self, repo_path: Path):
-        """Copy specified files and folders from repository to destination."""
+    def _vendor_files(self, repo_path: Path, jobs: Optional[int] = None):
+        """Copy specified files and folders from repository to destination.
+
+        Folders are vendored concurrently by up to `jobs` threads (default: one per
+        destination folder name).
+        """
         self.destination.mkdir(parents=True, exist_ok=True)
 
         # Vendor individual files
+        copies = []
         for file_path in self.files_to_vendor:
             src_path = repo_path / file_path
             dst_path = self.destination / Path(file_path).name
 
             if not src_path.exists():
-                print(f"Warning: File {file_path} not found in repository")
+                log.warning("Warning: File %s not found in repository", file_path)
                 continue
 
-            # Copy file
-            shutil.copy2(src_path, dst_path)
-            print(f"Vendored: {file_path} -> {dst_path}")
+            copies.append((src_path, dst_path))
+            log.debug("Vendored: %s -> %s", file_path, dst_path)
+        _copy_files(copies)
+        log.info("Vendored %d files", len(copies))
 
-        # Vendor folders
+        # Vendor folders. Folders with the same name share a destination, so
+        # those are vendored sequentially, in config order, by the same thread.
+        folder_groups: Dict[str, List[Dict]] = {}
         for folder_config in self.folders_to_vendor:
-            self._vendor_folder(repo_path, folder_config)
+            folder_name = Path(folder_config["path"]).name
+            folder_groups.setdefault(folder_name, []).append(folder_config)
+        if not folder_groups:
+            return
 
-    def check_and_update(self, force: bool = False) -> bool:
+        def _vendor_folder_group(folder_configs: List[Dict]):
+            for folder_config in folder_configs:
+                self._vendor_folder(repo_path, folder_config)
+
+        max_workers = jobs or len(folder_groups)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results so that errors are raised
+            list(executor.map(_vendor_folder_group, folder_groups.values()))
+
+    def check_and_update(
+        self,
+        force: bool = False,
+        force_reclone: bool = False,
+        jobs: Optional[int] = None,
+    ) -> bool:
         """Check for updates and vendor files if needed."""
-        print(
-            f"Checking for updates to {self.repo_info['owner']}/{self.repo_info['repo']}"
+        log.info(
+            "Checking for updates to %s/%s",
+            self.repo_info["owner"],
+            self.repo_info["repo"],
         )
 
         try:
-            version, commit_sha = self._get_latest_version()
+            latest = self._get_latest_version()
             current_version = self._get_current_version()
 
-            print(f"Latest version: {version} (commit: {commit_sha[:8]})")
-            print(f"Current version: {current_version or 'None'}")
+            force = force or force_reclone
+
+            if latest is None:
+                log.info("Latest release unchanged since last check")
+                if not force:
+                    log.info("No updates available")
+                    return False
+                info = self._get_vendor_info()
+                latest = info["version"], info["commit_sha"]
+
+            version, commit_sha = latest
+
+            log.info("Latest version: %s (commit: %s)", version, commit_sha[:8])
+            log.info("Current version: %s", current_version or "None")
 
             if not force and current_version == version:
-                print("No updates available")
+                log.info("No updates available")
+                self._save_etag()
                 return False
 
-            print(f"Updating to version {version}")
+            # target_commitish is often a branch name, which says nothing about
+            # the vendored content, so resolve the release tag to its commit.
+            # Branch names left unresolved never count as already vendored.
+            if not _COMMIT_SHA_RE.fullmatch(commit_sha):
+                commit_sha = self._resolve_commit_sha(version) or commit_sha
+            if (
+                not force_reclone
+                and _COMMIT_SHA_RE.fullmatch(commit_sha)
+                and commit_sha == self._get_current_commit_sha()
+            ):
+                log.info("Commit %s is already vendored", commit_sha[:8])
+                self._save_etag()
+                return False
 
-            # Clone repository
-            repo_path = self._clone_repository(commit_sha)
+            log.info("Updating to version %s", version)
 
             try:
-                self._vendor_files(repo_path)
-                self._save_version_info(version, commit_sha)
-                print(f"Successfully vendored version {version}")
-                return True
+                self._stream_vendor_from_tarball(commit_sha)
+            except RuntimeError as e:
+                log.warning("Warning: %s; falling back to git clone", e)
 
-            finally:  # Clean up temporary directory
-                shutil.rmtree(repo_path, ignore_errors=True)
+                # Clone repository
+                repo_path = self._clone_repository(commit_sha)
+
+                try:
+                    self._vendor_files(repo_path, jobs)
+                finally:  # Clean up temporary directory off the critical path
+                    _remove_in_background(repo_path)
+
+            self._save_version_info(version, commit_sha)
+            log.info("Successfully vendored version %s", version)
+            return True
 
         except Exception as e:
-            print(f"Error during update: {e}")
+            log.error("Error during update: %s", e)
             return False
 
 
+def _positive_int(value: str) -> int:
+    """Parse a strictly positive integer command line argument."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Vendor external library files")
@@ -269,7 +848,28 @@ def main():
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Force update even if version hasn't changed",
+        help=(
+            "Force update even if version hasn't changed, unless the release "
+            "commit is already vendored"
+        ),
+    )
+    parser.add_argument(
+        "--force-reclone",
+        action="store_true",
+        help="Force update even if the vendored commit hasn't changed",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        help=(
+            "Number of folders to vendor in parallel when falling back to a git "
+            "clone; the tarball download is a single stream (default: all)"
+        ),
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every vendored file",
     )
     parser.add_argument(
         "--check-only",
@@ -279,17 +879,27 @@ def main():
 
     args = parser.parse_args()
 
+    # Progress goes to stderr; stdout only carries the VENDOR_UPDATED status
+    log.addHandler(logging.StreamHandler(sys.stderr))
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
     try:
         vendor_manager = VendorManager(args.config)
 
         if args.check_only:
-            version, commit_sha = vendor_manager._get_latest_version()
+            latest = vendor_manager._get_latest_version()
             current_version = vendor_manager._get_current_version()
-            print(f"Latest version: {version} (commit: {commit_sha[:8]})")
-            print(f"Current version: {current_version or 'None'}")
+            if latest is None:
+                log.info("Latest release unchanged since last check")
+            else:
+                version, commit_sha = latest
+                log.info("Latest version: %s (commit: %s)", version, commit_sha[:8])
+            log.info("Current version: %s", current_version or "None")
             return 0
 
-        updated = vendor_manager.check_and_update(args.force)
+        updated = vendor_manager.check_and_update(
+            args.force, args.force_reclone, args.jobs
+        )
         # Always return 0 (success), but print the update status for the workflow
         if updated:
             print("VENDOR_UPDATED=true")
@@ -298,7 +908,7 @@ def main():
         return 0
 
     except Exception as e:
-        print(f"Error: {e}")
+        log.error("Error: %s", e)
         return 1
 
 
@@ -1,5 +1,31 @@
+import os
 import subprocess
 import sys
+from pathlib import Path
+
+import pytest
+from filelock import FileLock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="session")
+def built_wheel(tmp_path_factory):
+    """Build the package wheel once and share it across all CLI tests."""
+    root_tmp_dir = tmp_path_factory.getbasetemp()
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        # Under pytest-xdist, share one build between workers of this session
+        root_tmp_dir = root_tmp_dir.parent
+
+    out_dir = root_tmp_dir / "dist"
+    with FileLock(root_tmp_dir / "build.lock"):
+        if not any(out_dir.glob("*.whl")):
+            subprocess.run(
+                [sys.executable, "-m", "build", "--wheel", "--outdir", out_dir],
+                cwd=PROJECT_ROOT,
+                check=True,
+            )
+    return next(out_dir.glob("*.whl"))
 
 
 def check_correct_initialized_and_runs(test_dir):
@@ -21,13 +47,13 @@ def check_correct_initialized_and_runs(test_dir):
     )
 
 
-def test_cli_jaxnasium_uvx(tmp_path):
+def test_cli_jaxnasium_uvx(tmp_path, built_wheel):
     test_dir = tmp_path / "test_project"
-    subprocess.run(["uvx", "--no-cache", ".", test_dir, "-y"])
+    subprocess.run(["uvx", "--from", built_wheel, "create-rl-app", test_dir, "-y"])
     check_correct_initialized_and_runs(test_dir)
 
 
-def test_cli_jaxnasium_pipx(tmp_path):
+def test_cli_jaxnasium_pipx(tmp_path, built_wheel):
     test_dir = tmp_path / "test_project"
 
     # Use Python 3.11+ for pipx run since the package requires it
@@ -39,7 +65,7 @@ def test_cli_jaxnasium_pipx(tmp_path):
             "--python",
             "python3.11",  # Specify Python 3.11+ as required by the package
             "--spec",
-            ".",
+            built_wheel,
             "create-rl-app",
             test_dir,
             "-y",
@@ -51,29 +77,48 @@ def test_cli_jaxnasium_pipx(tmp_path):
     check_correct_initialized_and_runs(test_dir)
 
 
-def test_cli_no_env_template(tmp_path):
+def test_cli_no_env_template(tmp_path, built_wheel):
     test_dir = tmp_path / "test_project"
     subprocess.run(
-        ["uvx", "--no-cache", ".", test_dir, "-y", "--env-template", "false"]
+        [
+            "uvx",
+            "--from",
+            built_wheel,
+            "create-rl-app",
+            test_dir,
+            "-y",
+            "--env-template",
+            "false",
+        ]
     )
     check_correct_initialized_and_runs(test_dir)
 
 
-def test_cli_no_algorithm_source(tmp_path):
+def test_cli_no_algorithm_source(tmp_path, built_wheel):
     test_dir = tmp_path / "test_project"
     subprocess.run(
-        ["uvx", "--no-cache", ".", test_dir, "-y", "--algorithm-source", "false"]
+        [
+            "uvx",
+            "--from",
+            built_wheel,
+            "create-rl-app",
+            test_dir,
+            "-y",
+            "--algorithm-source",
+            "false",
+        ]
     )
     check_correct_initialized_and_runs(test_dir)
 
 
-def test_cli_neither_option(tmp_path):
+def test_cli_neither_option(tmp_path, built_wheel):
     test_dir = tmp_path / "test_project"
     subprocess.run(
         [
             "uvx",
-            "--no-cache",
-            ".",
+            "--from",
+            built_wheel,
+            "create-rl-app",
             test_dir,
             "-y",
             "--env-template",
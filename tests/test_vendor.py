@@ -0,0 +1,510 @@
+import fnmatch
+import io
+import json
+import logging
+import os
+import sys
+import tarfile
+from pathlib import Path
+
+import pytest
+import requests
+import urllib3
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import vendor  # noqa: E402
+
+
+def make_manager(tmp_path, folders, files=()):
+    """Create a VendorManager from a TOML config vendoring into tmp_path / "out"."""
+    lines = [
+        "[vendor]",
+        f"destination = {json.dumps((tmp_path / 'out').as_posix())}",
+        f"files = {json.dumps(list(files))}",
+        "[vendor.repository]",
+        'owner = "owner"',
+        'repo = "repo"',
+    ]
+    for folder in folders:
+        lines.append("[[vendor.folders]]")
+        lines.extend(f"{key} = {json.dumps(value)}" for key, value in folder.items())
+
+    config_path = tmp_path / "vendor.toml"
+    config_path.write_text("\n".join(lines) + "\n")
+    return vendor.VendorManager(config_path)
+
+
+def make_tree(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def vendored_files(root):
+    return sorted(
+        p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file()
+    )
+
+
+def make_response(status_code, body=b"", headers=None):
+    """Create a requests.Response that reads body from a urllib3 response."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), status=status_code, preload_content=False
+    )
+    return response
+
+
+def stub_session(monkeypatch, manager, *responses):
+    """Make the manager's session return responses in order; return the calls."""
+    calls = []
+    responses = list(responses)
+
+    def get(url, **kwargs):
+        calls.append((url, kwargs))
+        return responses.pop(0)
+
+    monkeypatch.setattr(manager._session, "get", get)
+    return calls
+
+
+def make_tarball(files, symlinks=(), dirs=()):
+    """Create a codeload-like .tar.gz with everything under "repo-sha/".
+
+    files maps paths to content or (content, mode), symlinks maps paths to targets.
+    Symlinks come first, so they precede their targets in the stream.
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name in dirs:
+            info = tarfile.TarInfo(f"repo-sha/{name}/")
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o775
+            tar.addfile(info)
+        for name, target in dict(symlinks).items():
+            info = tarfile.TarInfo(f"repo-sha/{name}")
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            info.mode = 0o777
+            tar.addfile(info)
+        for name, content in files.items():
+            content, mode = content if isinstance(content, tuple) else (content, 0o664)
+            data = content.encode()
+            info = tarfile.TarInfo(f"repo-sha/{name}")
+            info.size = len(data)
+            info.mode = mode
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_vendor_folder_empty_excludes_walks_subdirectories(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(repo, {"pkg/a.py": "a", "pkg/sub/b.py": "b", "pkg/sub/deep/c.py": "c"})
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    assert vendored_files(tmp_path / "out") == [
+        "pkg/a.py",
+        "pkg/sub/b.py",
+        "pkg/sub/deep/c.py",
+    ]
+
+
+def test_vendor_folder_excluded_directory_names(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(
+        repo,
+        {
+            "pkg/a.py": "a",
+            "pkg/utils/u.py": "u",
+            "pkg/sub/utils/u.py": "u",
+            "pkg/sub/__pycache__/b.pyc": "b",
+            "pkg/sub/b.py": "b",
+        },
+    )
+    manager = make_manager(
+        tmp_path, [{"path": "pkg", "exclude": ["utils", "__pycache__"]}]
+    )
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    assert vendored_files(tmp_path / "out") == ["pkg/a.py", "pkg/sub/b.py"]
+
+
+def test_vendor_folder_symlinks_like_os_walk(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(repo, {"pkg/a.py": "a", "other/b.py": "b"})
+    (repo / "pkg" / "link.py").symlink_to("a.py")
+    (repo / "pkg" / "linked_dir").symlink_to(repo / "other")
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    # Symlinked files are copied by content, symlinked directories not followed
+    assert vendored_files(tmp_path / "out") == ["pkg/a.py", "pkg/link.py"]
+    assert not (tmp_path / "out" / "pkg" / "link.py").is_symlink()
+    assert (tmp_path / "out" / "pkg" / "link.py").read_text() == "a"
+
+
+def test_vendor_folder_prefix_walk(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    make_tree(
+        repo,
+        {
+            "pkg/top.py": "t",
+            "pkg/sub/a.py": "a",
+            "pkg/sub/deep/b.py": "b",
+            "pkg/sub/c.txt": "c",
+            "pkg/other/d.py": "d",
+        },
+    )
+    manager = make_manager(tmp_path, [{"path": "pkg", "include": ["sub/*.py"]}])
+
+    walked = []
+    iter_files = vendor._iter_files
+
+    def recording_iter_files(root, rel_root, exclude_match):
+        walked.append(rel_root)
+        return iter_files(root, rel_root, exclude_match)
+
+    monkeypatch.setattr(vendor, "_iter_files", recording_iter_files)
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    # Like fnmatch, "*" also matches "/" so nested files are included
+    assert vendored_files(tmp_path / "out") == ["pkg/sub/a.py", "pkg/sub/deep/b.py"]
+    assert walked and all(root.startswith("sub") for root in walked)
+
+
+def test_vendor_folder_excluded_prefix_not_walked(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(repo, {"pkg/utils/u.py": "u", "pkg/a.py": "a"})
+    manager = make_manager(
+        tmp_path, [{"path": "pkg", "include": ["utils/*.py"], "exclude": ["utils"]}]
+    )
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    assert vendored_files(tmp_path / "out") == []
+
+
+def test_vendor_folder_suffix_and_complex_patterns(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(
+        repo,
+        {
+            "pkg/a.py": "a",
+            "pkg/a.pyi": "a",
+            "pkg/a.pyc": "a",
+            "pkg/a_test.py": "a",
+            "pkg/data/a.txt": "a",
+            "pkg/data/c.txt": "c",
+        },
+    )
+    manager = make_manager(
+        tmp_path,
+        [
+            {
+                "path": "pkg",
+                "include": ["*.py", "*.pyi", "data/[ab].txt"],
+                "exclude": ["*_test.py", "*.pyc"],
+            }
+        ],
+    )
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    assert vendored_files(tmp_path / "out") == [
+        "pkg/a.py",
+        "pkg/a.pyi",
+        "pkg/data/a.txt",
+    ]
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["*.py", "*.pyi"],
+        ["utils", "test_*.py", "*_test.py", "*.pyc"],
+        ["x.py", "*.py"],
+        ["x.py", "d/*.py"],
+        ["*.p[yi]", "*.txt"],
+    ],
+)
+def test_build_matcher_matches_fnmatch(patterns):
+    matcher = vendor._build_matcher(patterns)
+    for path in ["a.py", ".py", "x.py", "d/x.py", "a.pyi", "a.pyc", "a.pi", "utils"]:
+        expected = any(fnmatch.fnmatchcase(path, p) for p in patterns)
+        assert matcher(path) == expected, f"{patterns} on {path}"
+
+
+def test_vendor_folder_flattened_duplicates(tmp_path):
+    repo = tmp_path / "repo"
+    sources = {f"pkg/pkg{i}/__init__.py": str(i) * 100_000 for i in range(40)}
+    make_tree(repo, sources)
+    manager = make_manager(tmp_path, [{"path": "pkg", "preserve_structure": False}])
+
+    manager._vendor_folder(repo, manager.folders_to_vendor[0])
+
+    content = (tmp_path / "out" / "pkg" / "__init__.py").read_text()
+    assert content in sources.values(), "Flattened file is a mix of several sources"
+
+
+def test_vendor_files_same_folder_name_last_config_wins(tmp_path):
+    repo = tmp_path / "repo"
+    make_tree(repo, {"a/utils/u.py": "a" * 100_000, "b/utils/u.py": "b" * 100_000})
+    manager = make_manager(tmp_path, [{"path": "a/utils"}, {"path": "b/utils"}])
+
+    manager._vendor_files(repo)
+
+    assert (tmp_path / "out" / "utils" / "u.py").read_text() == "b" * 100_000
+
+
+def test_stream_vendor_flattened(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg", "preserve_structure": False}])
+    tarball = make_tarball({"pkg/a.py": "a", "pkg/sub/b.py": "b", "other/c.py": "c"})
+    calls = stub_session(monkeypatch, manager, make_response(200, tarball))
+
+    manager._stream_vendor_from_tarball("sha")
+
+    assert calls[0][0] == "https://codeload.github.com/owner/repo/tar.gz/sha"
+    assert vendored_files(tmp_path / "out") == ["pkg/a.py", "pkg/b.py"]
+    assert (tmp_path / "out" / "pkg" / "b.py").read_text() == "b"
+
+
+def test_stream_vendor_excluded_directory(tmp_path, monkeypatch):
+    manager = make_manager(
+        tmp_path, [{"path": "pkg", "exclude": ["utils"]}], files=["README.md"]
+    )
+    tarball = make_tarball(
+        {
+            "README.md": "readme",
+            "pkg/a.py": "a",
+            "pkg/utils/u.py": "u",
+            "pkg/sub/utils/deep/u.py": "u",
+        }
+    )
+    stub_session(monkeypatch, manager, make_response(200, tarball))
+
+    manager._stream_vendor_from_tarball("sha")
+
+    assert vendored_files(tmp_path / "out") == ["README.md", "pkg/a.py"]
+
+
+def test_stream_vendor_keeps_executable_bit(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    tarball = make_tarball({"pkg/run.sh": ("#!/bin/sh", 0o775), "pkg/a.py": "a"})
+    stub_session(monkeypatch, manager, make_response(200, tarball))
+
+    manager._stream_vendor_from_tarball("sha")
+
+    assert os.access(tmp_path / "out" / "pkg" / "run.sh", os.X_OK)
+    assert not os.access(tmp_path / "out" / "pkg" / "a.py", os.X_OK)
+
+
+def test_stream_vendor_symlinks_like_fallback(tmp_path, monkeypatch, caplog):
+    manager = make_manager(tmp_path, [{"path": "pkg"}], files=["LINK.md"])
+    tarball = make_tarball(
+        {"README.md": "readme", "pkg/a.py": "a", "other/b.py": "b", "pkg/last.py": "z"},
+        symlinks={
+            "pkg/first.py": "last.py",
+            "pkg/link.py": "a.py",
+            "pkg/chain.py": "link.py",
+            "pkg/linked_dir": "../other",
+            "pkg/outside.py": "../other/b.py",
+            "LINK.md": "pkg/a.py",
+        },
+        dirs=["pkg", "other"],
+    )
+    stub_session(monkeypatch, manager, make_response(200, tarball))
+
+    with caplog.at_level(logging.WARNING, logger="vendor"):
+        manager._stream_vendor_from_tarball("sha")
+
+    out = tmp_path / "out"
+    assert vendored_files(out) == [
+        "LINK.md",
+        "pkg/a.py",
+        "pkg/chain.py",
+        "pkg/first.py",
+        "pkg/last.py",
+        "pkg/link.py",
+    ]
+    assert not (out / "pkg" / "link.py").is_symlink()
+    assert (out / "pkg" / "chain.py").read_text() == "a"
+    assert (out / "pkg" / "first.py").read_text() == "z"
+    assert (out / "LINK.md").read_text() == "a"
+    # other/b.py is not vendored, so the symlink to it cannot be either
+    assert "pkg/outside.py" in caplog.text
+    assert "not found" not in caplog.text
+
+
+def test_stream_vendor_truncated_leaves_destination_untouched(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    out = tmp_path / "out"
+    make_tree(out, {"pkg/a.py": "old", ".vendor_version": "v1\n"})
+    manager._save_version_info("v1", "0" * 40)
+    before = {path: (out / path).read_bytes() for path in vendored_files(out)}
+
+    files = {f"pkg/{i}.py": os.urandom(1000).hex() for i in range(20)}
+    tarball = make_tarball({"pkg/a.py": "new", **files})
+    stub_session(monkeypatch, manager, make_response(200, tarball[: len(tarball) // 2]))
+
+    with pytest.raises(RuntimeError, match="Failed to stream"):
+        manager._stream_vendor_from_tarball("sha")
+
+    assert {path: (out / path).read_bytes() for path in vendored_files(out)} == before
+    assert not list(tmp_path.glob(".vendor_*"))
+
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+def save_vendored(manager, version, commit_sha, etag=None):
+    """Write the vendor metadata as if version was vendored with an ETag."""
+    manager._etag = etag
+    manager._save_version_info(version, commit_sha)
+
+
+def release_response(version, commit_sha, etag):
+    body = json.dumps({"tag_name": version, "target_commitish": commit_sha})
+    return make_response(200, body.encode(), {"ETag": etag})
+
+
+def test_not_modified_release_skips_update(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", "main", etag='"abc"')
+    calls = stub_session(monkeypatch, manager, make_response(304))
+
+    assert manager.check_and_update() is False
+    assert len(calls) == 1
+    assert calls[0][1]["headers"]["If-None-Match"] == '"abc"'
+
+
+def test_not_modified_release_force_revendors_stored_version(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", "main", etag='"abc"')
+    calls = stub_session(
+        monkeypatch,
+        manager,
+        make_response(304),
+        make_response(200, SHA.encode()),
+        make_response(200, make_tarball({"pkg/a.py": "a"})),
+    )
+
+    assert manager.check_and_update(force=True) is True
+    assert calls[1][0].endswith("/commits/v1")
+    assert calls[2][0].endswith(f"/tar.gz/{SHA}")
+    assert vendored_files(tmp_path / "out") == [
+        ".vendor_info",
+        ".vendor_version",
+        "pkg/a.py",
+    ]
+    info = manager._get_vendor_info()
+    assert (info["version"], info["commit_sha"], info["etag"]) == ("v1", SHA, '"abc"')
+
+
+def test_changed_etag_persisted_without_update(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", "main", etag='"old"')
+    calls = stub_session(monkeypatch, manager, release_response("v1", "main", '"new"'))
+
+    assert manager.check_and_update() is False
+    assert len(calls) == 1
+    assert manager._get_vendor_info()["etag"] == '"new"'
+
+
+def test_same_commit_force_skips_update(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", SHA)
+    calls = stub_session(
+        monkeypatch,
+        manager,
+        release_response("v1", "main", '"new"'),
+        make_response(200, SHA.encode()),
+    )
+
+    assert manager.check_and_update(force=True) is False
+    assert calls[1][1]["headers"]["Accept"] == "application/vnd.github.sha"
+    assert len(calls) == 2
+    assert manager._get_vendor_info()["etag"] == '"new"'
+
+
+def test_same_commit_force_reclone_revendors(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", SHA)
+    calls = stub_session(
+        monkeypatch,
+        manager,
+        release_response("v1", SHA, '"new"'),
+        make_response(200, make_tarball({"pkg/a.py": "a"})),
+    )
+
+    assert manager.check_and_update(force_reclone=True) is True
+    # A full SHA in target_commitish is used without resolving the tag
+    assert calls[1][0].endswith(f"/tar.gz/{SHA}")
+    assert (tmp_path / "out" / "pkg" / "a.py").read_text() == "a"
+
+
+def test_unresolved_branch_never_skips(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    save_vendored(manager, "v1", "main")
+    calls = stub_session(
+        monkeypatch,
+        manager,
+        release_response("v2", "main", '"new"'),
+        make_response(404),
+        make_response(200, make_tarball({"pkg/a.py": "a"})),
+    )
+
+    assert manager.check_and_update() is True
+    assert calls[2][0].endswith("/tar.gz/main")
+    assert manager._get_current_version() == "v2"
+
+
+def test_save_version_info_unchanged_is_not_rewritten(tmp_path):
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+    out = tmp_path / "out"
+    save_vendored(manager, "v1", SHA, etag='"abc"')
+    metadata = [out / ".vendor_version", out / ".vendor_info"]
+    for path in metadata:
+        # Backdate, so a rewrite is visible even on coarse mtime filesystems
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    before = [(path.read_bytes(), path.stat().st_mtime_ns) for path in metadata]
+
+    save_vendored(manager, "v1", SHA, etag='"abc"')
+
+    assert [(path.read_bytes(), path.stat().st_mtime_ns) for path in metadata] == before
+    assert not list(out.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("cache_home", [None, "", "relative/cache"])
+def test_cache_dir_ignores_unset_and_relative_xdg_cache_home(
+    tmp_path, monkeypatch, cache_home
+):
+    if cache_home is None:
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    else:
+        monkeypatch.setenv("XDG_CACHE_HOME", cache_home)
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+
+    cache_dir = manager._get_cache_dir()
+
+    assert cache_dir == tmp_path / "home" / ".cache" / "vendor" / "owner-repo.git"
+
+
+def test_cache_dir_does_not_need_home_with_xdg_cache_home(tmp_path, monkeypatch):
+    def no_home():
+        raise RuntimeError("Could not determine home directory.")
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(Path, "home", no_home)
+    manager = make_manager(tmp_path, [{"path": "pkg"}])
+
+    cache_dir = manager._get_cache_dir()
+
+    assert cache_dir == tmp_path / "cache" / "vendor" / "owner-repo.git"